@@ -1,10 +1,7 @@
 from django.contrib import admin
-from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from .models import Category, Location, Post, Comment
 
-User = get_user_model()
-
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -30,6 +27,8 @@ class PostAdmin(admin.ModelAdmin):
     list_editable = ('is_published',)
     readonly_fields = ('created_at',)
     date_hierarchy = 'pub_date'
+    list_select_related = ('author', 'category', 'location')
+    raw_id_fields = ('author', 'category', 'location')
 
 
 @admin.register(Comment)
@@ -38,13 +37,10 @@ class CommentAdmin(admin.ModelAdmin):
     list_filter = ('created_at', 'author')
     search_fields = ('text', 'author__username', 'post__title')
     readonly_fields = ('created_at',)
+    list_select_related = ('author', 'post')
+    raw_id_fields = ('author', 'post')
 
 
-# Отменяем регистрацию User, если она уже есть
-if admin.site.is_registered(User):
-    admin.site.unregister(User)
-
-
-@admin.register(User)
+# Регистрируется в BlogConfig.ready() вместо стандартного UserAdmin
 class CustomUserAdmin(BaseUserAdmin):
     pass
@@ -5,3 +5,17 @@ class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        from django.contrib import admin
+        from django.contrib.auth import get_user_model
+
+        from . import signals  # noqa: F401
+        from .admin import CustomUserAdmin
+
+        # Заменяем стандартную регистрацию User, когда все приложения
+        # уже загружены и admin.autodiscover() отработал
+        User = get_user_model()
+        if admin.site.is_registered(User):
+            admin.site.unregister(User)
+        admin.site.register(User, CustomUserAdmin)
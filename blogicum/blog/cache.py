@@ -0,0 +1,67 @@
+from functools import wraps
+
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+POSTS_VERSION_KEY = 'posts:version'
+HTTP_CACHE_MAX_AGE = 60
+HTTP_CACHE_STALE_WHILE_REVALIDATE = 300
+
+
+def get_posts_version():
+    """Возвращает текущую версию данных публикаций."""
+    return cache.get(POSTS_VERSION_KEY, 0)
+
+
+def get_request_posts_version(request):
+    """Возвращает версию данных публикаций, читая её один раз за запрос."""
+    if not hasattr(request, '_posts_version'):
+        request._posts_version = get_posts_version()
+    return request._posts_version
+
+
+def bump_posts_version():
+    """Увеличивает версию данных публикаций, сбрасывая кеш страниц."""
+    cache.add(POSTS_VERSION_KEY, 0, timeout=None)
+    try:
+        cache.incr(POSTS_VERSION_KEY)
+    except ValueError:
+        # Ключ успели вытеснить между add и incr
+        cache.set(POSTS_VERSION_KEY, 1, timeout=None)
+
+
+def posts_etag(request, *args, **kwargs):
+    """Возвращает ETag страницы по версии публикаций.
+
+    В ETag входит и текущая минута: отложенные публикации появляются
+    без изменения данных, и версия одна этого не отражает.
+    """
+    minute = int(timezone.now().timestamp()) // 60
+    return f'{get_request_posts_version(request)}-{minute}'
+
+
+def public_cache_for_anonymous(view_func):
+    """Разрешает публичное HTTP-кеширование страницы для анонимов.
+
+    Страницы авторизованных пользователей содержат их данные,
+    поэтому отдаются без заголовков кеширования.
+    """
+    cached_view = cache_control(
+        public=True,
+        max_age=HTTP_CACHE_MAX_AGE,
+        stale_while_revalidate=HTTP_CACHE_STALE_WHILE_REVALIDATE
+    )(condition(etag_func=posts_etag)(view_func))
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated:
+            response = view_func(request, *args, **kwargs)
+        else:
+            response = cached_view(request, *args, **kwargs)
+        patch_vary_headers(response, ('Cookie',))
+        return response
+
+    return wrapper
@@ -0,0 +1,23 @@
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_table(apps, schema_editor):
+    # Таблица кеша нужна сигналам блога с первой же записи в базу,
+    # поэтому создаём её вместе со схемой, а не отдельной командой
+    call_command(
+        'createcachetable',
+        database=schema_editor.connection.alias,
+        verbosity=0
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_table, migrations.RunPython.noop),
+    ]
@@ -33,6 +33,12 @@ class Category(models.Model):
     class Meta:
         verbose_name = 'категория'
         verbose_name_plural = 'Категории'
+        indexes = (
+            models.Index(
+                fields=('is_published',),
+                name='category_published_idx'
+            ),
+        )
 
     def __str__(self):
         return self.title
@@ -61,6 +67,31 @@ class Location(models.Model):
         return self.name
 
 
+class PostQuerySet(models.QuerySet):
+    # Поля, которые выводит карточка поста в списках (includes/post_card.html)
+    LIST_FIELDS = (
+        'id', 'title', 'text', 'pub_date', 'image', 'is_published',
+        'comment_count', 'author', 'category', 'location',
+        'author__username',
+        'category__slug', 'category__title', 'category__is_published',
+        'location__name', 'location__is_published',
+    )
+
+    def for_listing(self):
+        """Посты со связанными объектами и полями для карточки в списке."""
+        return self.select_related(
+            'category', 'location', 'author'
+        ).only(*self.LIST_FIELDS)
+
+    def published(self, now):
+        """Опубликованные к моменту now посты опубликованных категорий."""
+        return self.filter(
+            is_published=True,
+            category__is_published=True,
+            pub_date__lte=now
+        )
+
+
 class Post(models.Model):
     title = models.CharField(
         max_length=256,
@@ -109,11 +140,25 @@ class Post(models.Model):
         blank=True,
         verbose_name='Изображение'
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date',),
+                condition=models.Q(is_published=True),
+                name='post_pub_published_idx'
+            ),
+        )
 
     def __str__(self):
         return self.title
@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_posts_version
+from .models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+
+def refresh_comment_count(post_id):
+    """Пересчитывает счётчик комментариев поста одним UPDATE.
+
+    Счётчик берётся из таблицы комментариев, а не из сохранённого
+    значения, поэтому не расходится с ней после каскадных удалений
+    и загрузки фикстур.
+    """
+    total = Comment.objects.filter(
+        post=OuterRef('pk')
+    ).order_by().values('post').annotate(total=Count('pk')).values('total')
+    Post.objects.filter(pk=post_id).update(
+        comment_count=Coalesce(Subquery(total), 0)
+    )
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_count_on_save(sender, instance, created, raw, **kwargs):
+    """Обновляет счётчик комментариев поста при создании комментария.
+
+    При загрузке фикстур (raw) счётчик поста загружается вместе с ним.
+    """
+    if created and not raw:
+        refresh_comment_count(instance.post_id)
+
+
+@receiver(post_delete, sender=Comment)
+def update_comment_count_on_delete(sender, instance, **kwargs):
+    """Обновляет счётчик комментариев поста при удалении комментария."""
+    refresh_comment_count(instance.post_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_posts_cache(sender, **kwargs):
+    """Сбрасывает закешированные страницы ленты при изменении данных."""
+    bump_posts_version()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_posts_cache_on_user_change(
+    sender, update_fields=None, **kwargs
+):
+    """Сбрасывает кеш страниц при изменении пользователя.
+
+    Имя автора выводится в карточках постов, а данные профиля — на его
+    странице. Обновление одного last_login при входе их не меняет.
+    """
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    bump_posts_version()
@@ -1,75 +1,187 @@
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import UserCreationForm
-from django.core.paginator import Paginator
-from django.db.models import Count
+from django.core.paginator import (
+    EmptyPage,
+    InvalidPage,
+    Page,
+    PageNotAnInteger,
+    Paginator,
+)
+from django.db.models import Q
+from django.http import Http404
 from django.shortcuts import render, get_object_or_404, redirect
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
 from django.views.decorators.http import require_http_methods
+from .cache import public_cache_for_anonymous
 from .models import Post, Category, Comment
 from .forms import PostForm, CommentForm, UserForm
 
 User = get_user_model()
 
+# Верхняя граница BigAutoField, которым задан первичный ключ Post
+MAX_CURSOR_ID = 2 ** 63 - 1
 
-def get_posts_with_comment_count(queryset=None, filter_published=True):
-    """Добавляет количество комментариев к queryset постов.
-    
-    Args:
-        queryset: QuerySet постов. Если None, используется Post.objects.all()
-        filter_published: Если True, фильтрует только опубликованные посты.
-                         Если False, пропускает фильтрацию (для постов автора).
+
+def get_request_now(request):
+    """Возвращает момент обработки запроса, вычисляя его один раз."""
+    if not hasattr(request, '_now'):
+        request._now = timezone.now()
+    return request._now
+
+
+def get_authored_object(model, user, **lookup):
+    """Возвращает объект пользователя user или None, если автор другой.
+
+    Авторство проверяется в самом запросе; если объекта нет совсем,
+    вызывается Http404.
+    """
+    obj = model.objects.filter(author=user, **lookup).first()
+    if obj is None and not model.objects.filter(**lookup).exists():
+        raise Http404
+    return obj
+
+
+class FastCountPaginator(Paginator):
+    """Пагинатор, считающий объекты без аннотаций и сортировки.
+
+    COUNT по аннотированному queryset превращается в подзапрос
+    с GROUP BY, поэтому количество считается по одним первичным ключам.
+    """
+
+    @cached_property
+    def count(self):
+        return self.object_list.order_by().values('pk').count()
+
+
+def encode_cursor(number, post):
+    """Кодирует курсор страницы number, начинающейся после поста post.
+
+    В курсор входят номер страницы и ключ (pub_date, id) поста, так что
+    номер страницы, выбранной по ключу, берётся из самого курсора.
+    """
+    raw = f'{number}|{post.pub_date.isoformat()}|{post.pk}'
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Декодирует курсор в тройку (номер, pub_date, id) или возвращает None.
+
+    Курсор приходит из запроса, поэтому номер страницы меньше второй,
+    дата без часового пояса или вне допустимого диапазона и id вне
+    диапазона BigAutoField считаются некорректными.
     """
-    if queryset is None:
-        queryset = Post.objects.all()
-    if filter_published:
-        queryset = queryset.filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lte=timezone.now()
+    try:
+        number, pub_date, pk = (
+            urlsafe_b64decode(cursor.encode()).decode().split('|')
         )
-    return queryset.annotate(
-        comment_count=Count('comments')
-    ).order_by(*Post._meta.ordering)
+        number = int(number)
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+        if pub_date is None or timezone.is_naive(pub_date):
+            return None
+        pub_date = pub_date.astimezone(timezone.utc)
+    except (ValueError, OverflowError, binascii.Error):
+        return None
+    if number < 2 or not 0 < pk <= MAX_CURSOR_ID:
+        return None
+    return number, pub_date, pk
 
 
-def get_page_obj(queryset, request, per_page=10):
-    """Возвращает объект страницы пагинатора для queryset."""
-    paginator = Paginator(queryset, per_page)
-    page_number = request.GET.get('page')
-    return paginator.get_page(page_number)
+def set_next_cursor(page_obj):
+    """Добавляет странице курсор, с которого начинается следующая."""
+    page_obj.next_cursor = None
+    if page_obj.has_next() and page_obj.object_list:
+        page_obj.next_cursor = encode_cursor(
+            page_obj.next_page_number(), page_obj.object_list[-1]
+        )
+    return page_obj
 
 
-def index(request):
-    post_list = Post.objects.select_related(
-        'category', 'location', 'author'
+def get_keyset_params(paginator, request):
+    """Возвращает проверенные номер страницы и ключ курсора из запроса.
+
+    При корректном курсоре номер страницы берётся из него, а параметр
+    page не учитывается. Иначе номер читается из page и некорректный
+    заменяется так же, как в Paginator.get_page().
+    """
+    cursor = decode_cursor(request.GET.get('after', ''))
+    if cursor is not None:
+        number, pub_date, pk = cursor
+        try:
+            return paginator.validate_number(number), (pub_date, pk)
+        except InvalidPage:
+            pass
+    try:
+        number = paginator.validate_number(request.GET.get('page'))
+    except PageNotAnInteger:
+        return 1, None
+    except EmptyPage:
+        return paginator.num_pages, None
+    return number, None
+
+
+def get_keyset_page(paginator, number, cursor):
+    """Возвращает страницу number; при наличии курсора выбирает её по ключу."""
+    if cursor is None:
+        page_obj = paginator.page(number)
+        page_obj.object_list = list(page_obj.object_list)
+    else:
+        pub_date, pk = cursor
+        object_list = list(paginator.object_list.filter(
+            Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+        )[:paginator.per_page])
+        page_obj = Page(object_list, number, paginator)
+    return set_next_cursor(page_obj)
+
+
+def paginate_keyset(queryset, request, per_page=10):
+    """Возвращает страницу постов, упорядоченных по (pub_date, id).
+
+    Если в запросе передан курсор after, записи страницы выбираются
+    условием по ключу (pub_date, id) вместо OFFSET, и стоимость перехода
+    на следующую страницу не растёт с её номером. Без курсора или
+    с некорректным курсором работает обычная пагинация по номеру.
+    """
+    paginator = FastCountPaginator(
+        queryset.order_by('-pub_date', '-id'), per_page
     )
-    post_list = get_posts_with_comment_count(post_list, filter_published=True)
-    page_obj = get_page_obj(post_list, request)
+    number, cursor = get_keyset_params(paginator, request)
+    return get_keyset_page(paginator, number, cursor)
+
+
+@public_cache_for_anonymous
+def index(request):
+    post_list = Post.objects.for_listing().published(get_request_now(request))
+    page_obj = paginate_keyset(post_list, request)
     
     context = {'page_obj': page_obj}
     return render(request, 'blog/index.html', context)
 
 
+@public_cache_for_anonymous
 def post_detail(request, id):
-    # Первый вызов: извлечение поста по ключу из полной таблицы
     post = get_object_or_404(
         Post.objects.select_related('category', 'location', 'author'),
         id=id
     )
-    
-    # Второй вызов: для не-авторов проверяем доступ через опубликованные посты
-    if request.user != post.author:
-        post = get_object_or_404(
-            Post.objects.select_related('category', 'location', 'author').filter(
-                is_published=True,
-                category__is_published=True,
-                pub_date__lte=timezone.now()
-            ),
-            id=id
-        )
-    
-    comments = post.comments.all()
+
+    # Для не-авторов проверяем публикацию уже полученного поста,
+    # не запрашивая его из базы повторно
+    if post.author_id != request.user.id and not (
+        post.is_published
+        and post.category is not None
+        and post.category.is_published
+        and post.pub_date <= get_request_now(request)
+    ):
+        raise Http404
+
+    comments = post.comments.select_related('author')
     form = CommentForm()
     
     context = {
@@ -80,17 +192,17 @@ def post_detail(request, id):
     return render(request, 'blog/detail.html', context)
 
 
+@public_cache_for_anonymous
 def category_posts(request, category_slug):
     category = get_object_or_404(
         Category,
         slug=category_slug,
         is_published=True
     )
-    post_list = category.post_set.select_related(
-        'category', 'location', 'author'
+    post_list = category.post_set.for_listing().published(
+        get_request_now(request)
     )
-    post_list = get_posts_with_comment_count(post_list, filter_published=True)
-    page_obj = get_page_obj(post_list, request)
+    page_obj = paginate_keyset(post_list, request)
     
     context = {
         'category': category,
@@ -112,9 +224,8 @@ def post_create(request):
 
 @login_required
 def post_edit(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
-    
-    if post.author != request.user:
+    post = get_authored_object(Post, request.user, id=post_id)
+    if post is None:
         return redirect('blog:post_detail', id=post_id)
     
     form = PostForm(request.POST or None, request.FILES or None, instance=post)
@@ -127,9 +238,8 @@ def post_edit(request, post_id):
 @login_required
 @require_http_methods(['GET', 'POST'])
 def post_delete(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
-    
-    if post.author != request.user:
+    post = get_authored_object(Post, request.user, id=post_id)
+    if post is None:
         return redirect('blog:post_detail', id=post_id)
     
     if request.method == 'POST':
@@ -142,11 +252,14 @@ def post_delete(request, post_id):
 
 @login_required
 def add_comment(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    # Пост нужен только для внешнего ключа, поэтому лишь проверяем,
+    # что он существует
+    if not Post.objects.filter(pk=post_id).exists():
+        raise Http404
     form = CommentForm(request.POST or None)
     if form.is_valid():
         comment = form.save(commit=False)
-        comment.post = post
+        comment.post_id = post_id
         comment.author = request.user
         comment.save()
         return redirect('blog:post_detail', id=post_id)
@@ -155,9 +268,10 @@ def add_comment(request, post_id):
 
 @login_required
 def edit_comment(request, post_id, comment_id):
-    comment = get_object_or_404(Comment, id=comment_id, post_id=post_id)
-    
-    if comment.author != request.user:
+    comment = get_authored_object(
+        Comment, request.user, id=comment_id, post_id=post_id
+    )
+    if comment is None:
         return redirect('blog:post_detail', id=post_id)
     
     form = CommentForm(request.POST or None, instance=comment)
@@ -175,9 +289,10 @@ def edit_comment(request, post_id, comment_id):
 @login_required
 @require_http_methods(['GET', 'POST'])
 def delete_comment(request, post_id, comment_id):
-    comment = get_object_or_404(Comment, id=comment_id, post_id=post_id)
-    
-    if comment.author != request.user:
+    comment = get_authored_object(
+        Comment, request.user, id=comment_id, post_id=post_id
+    )
+    if comment is None:
         return redirect('blog:post_detail', id=post_id)
     
     if request.method == 'POST':
@@ -190,16 +305,22 @@ def delete_comment(request, post_id, comment_id):
     return render(request, 'blog/comment.html', context)
 
 
+@public_cache_for_anonymous
 def profile(request, username):
-    user = get_object_or_404(User, username=username)
-    
-    # Для автора показываем все посты, для остальных - только опубликованные
-    post_list = user.post_set.select_related(
-        'category', 'location', 'author'
+    # Загружаем только поля, которые выводит шапка профиля
+    user = get_object_or_404(
+        User.objects.only(
+            'id', 'username', 'first_name', 'last_name',
+            'date_joined', 'is_staff'
+        ),
+        username=username
     )
-    filter_published = request.user != user
-    post_list = get_posts_with_comment_count(post_list, filter_published=filter_published)
-    page_obj = get_page_obj(post_list, request)
+
+    # Для автора показываем все посты, для остальных - только опубликованные
+    post_list = user.post_set.for_listing()
+    if user.id != request.user.id:
+        post_list = post_list.published(get_request_now(request))
+    page_obj = paginate_keyset(post_list, request)
     
     context = {
         'profile': user,
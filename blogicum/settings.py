@@ -86,6 +86,19 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# Кеш общий для всех процессов: через него ETag страниц у всех воркеров
+# зависит от одной версии публикаций. Таблицу создаёт миграция blog 0005.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'blogicum_cache',
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,126 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import cache, caches
+from django.test import Client
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+CACHE_WRITE_METHODS = ("set", "add", "set_many", "incr", "delete")
+
+
+@pytest.fixture
+def cache_writes():
+    """Записывает вызовы методов кеша, изменяющих данные."""
+    calls = []
+    backend = caches["default"]
+    patchers = [
+        mock.patch.object(
+            backend,
+            name,
+            side_effect=lambda *args, _name=name, **kwargs: calls.append(
+                _name
+            ),
+        )
+        for name in CACHE_WRITE_METHODS
+    ]
+    for patcher in patchers:
+        patcher.start()
+    yield calls
+    for patcher in patchers:
+        patcher.stop()
+
+
+def test_anonymous_list_views_do_not_write_cache(
+        unlogged_client, many_posts_with_published_locations, cache_writes
+):
+    post = many_posts_with_published_locations[0]
+    for url in (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    ):
+        unlogged_client.get(url)
+        for i in range(5):
+            unlogged_client.get(url, {"after": f"junk{i}" * 50})
+            unlogged_client.get(url, {"page": f"junk{i}"})
+            unlogged_client.get(url, {"page": 1000 + i})
+    assert cache_writes == [], (
+        "Убедитесь, что просмотр списков публикаций, в том числе"
+        " с некорректными параметрами `page` и `after`, не записывает"
+        " данные в кеш."
+    )
+
+
+def test_etag_changes_on_post_write(
+        unlogged_client, many_posts_with_published_locations
+):
+    response = unlogged_client.get("/")
+    post = response.context["page_obj"][0]
+    post.title = "Новый заголовок"
+    post.save()
+    response = unlogged_client.get("/", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 200, (
+        "Убедитесь, что ETag главной страницы меняется"
+        " при изменении публикации."
+    )
+    assert "Новый заголовок" in response.content.decode("utf-8")
+
+
+def test_anonymous_pages_are_publicly_cacheable(
+        unlogged_client, post_with_published_location
+):
+    post = post_with_published_location
+    for url in (
+        "/",
+        f"/posts/{post.id}/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    ):
+        response = unlogged_client.get(url)
+        assert "public" in response["Cache-Control"]
+        assert "max-age=60" in response["Cache-Control"]
+        assert "Cookie" in response["Vary"]
+        etag = response["ETag"]
+        not_modified = unlogged_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert not_modified.status_code == 304, (
+            "Убедитесь, что для анонимного пользователя страница"
+            f" `{url}` с неизменённым ETag возвращает 304."
+        )
+
+
+def test_logged_in_pages_are_not_cached(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    anonymous_etag = Client().get(f"/posts/{post.id}/")["ETag"]
+    response = user_client.get(
+        f"/posts/{post.id}/", HTTP_IF_NONE_MATCH=anonymous_etag
+    )
+    assert response.status_code == 200
+    assert not response.has_header("ETag")
+    assert "public" not in response.get("Cache-Control", "")
+    assert "Cookie" in response["Vary"]
+
+
+def test_profile_etag_changes_on_user_edit(
+        unlogged_client, user, post_with_published_location
+):
+    url = f"/profile/{user.username}/"
+    etag = unlogged_client.get(url)["ETag"]
+    user.first_name = "Новое имя"
+    user.save()
+    response = unlogged_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что ETag страницы пользователя меняется"
+        " при изменении его данных."
+    )
+    assert "Новое имя" in response.content.decode("utf-8")
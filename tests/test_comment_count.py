@@ -0,0 +1,73 @@
+import pytest
+from django.core.management import call_command
+from django.db.models import Model
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_comment_count(post: Model) -> int:
+    post.refresh_from_db(fields=["comment_count"])
+    return post.comment_count
+
+
+def test_comment_count_on_create_and_delete(
+        mixer: Mixer, post_with_published_location, another_user
+):
+    post = post_with_published_location
+    assert get_comment_count(post) == 0
+
+    comments = mixer.cycle(3).blend(
+        "blog.Comment", post=post, author=another_user
+    )
+    assert get_comment_count(post) == 3, (
+        "Убедитесь, что счётчик комментариев поста увеличивается"
+        " при создании комментария."
+    )
+
+    comments[0].text = "Изменённый текст"
+    comments[0].save()
+    assert get_comment_count(post) == 3
+
+    comments[0].delete()
+    assert get_comment_count(post) == 2, (
+        "Убедитесь, что счётчик комментариев поста уменьшается"
+        " при удалении комментария."
+    )
+
+
+def test_comment_count_on_cascade_delete(
+        mixer: Mixer, post_with_published_location, user, another_user
+):
+    post = post_with_published_location
+    mixer.blend("blog.Comment", post=post, author=user)
+    mixer.cycle(2).blend("blog.Comment", post=post, author=another_user)
+    assert get_comment_count(post) == 3
+
+    another_user.delete()
+    assert get_comment_count(post) == 1, (
+        "Убедитесь, что счётчик комментариев поста уменьшается"
+        " при каскадном удалении комментариев."
+    )
+
+
+def test_comment_count_survives_loaddata(
+        mixer: Mixer, post_with_published_location, another_user, tmp_path,
+        CommentModel
+):
+    post = post_with_published_location
+    mixer.blend("blog.Comment", post=post, author=another_user)
+    assert get_comment_count(post) == 1
+
+    fixture = tmp_path / "blog.json"
+    call_command(
+        "dumpdata", "blog.post", "blog.comment", output=str(fixture)
+    )
+    CommentModel.objects.all().delete()
+    assert get_comment_count(post) == 0
+
+    call_command("loaddata", str(fixture), verbosity=0)
+    assert get_comment_count(post) == 1, (
+        "Убедитесь, что счётчик комментариев не увеличивается повторно"
+        " при загрузке фикстур."
+    )
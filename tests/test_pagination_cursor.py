@@ -0,0 +1,92 @@
+from base64 import urlsafe_b64encode
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def make_cursor(raw: str) -> str:
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def get_list_urls(posts):
+    post = posts[0]
+    return (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    )
+
+
+NOW = timezone.now().isoformat()
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-a-cursor",
+        make_cursor(f"2|{NOW}|{10 ** 30}"),
+        make_cursor(f"2|{NOW}|{2 ** 63}"),
+        make_cursor(f"2|{NOW}|0"),
+        make_cursor(f"2|{NOW}|-5"),
+        make_cursor("2|2020-01-01T00:00:00|5"),
+        make_cursor("2|0001-01-01T00:00:00+05:00|5"),
+        make_cursor("2|2020-13-01T00:00:00+00:00|5"),
+        make_cursor(f"2|{NOW}|5|6"),
+        make_cursor(f"{NOW}|5"),
+        make_cursor(f"1|{NOW}|5"),
+        make_cursor(f"-3|{NOW}|5"),
+        make_cursor(f"x|{NOW}|5"),
+        make_cursor(f"{10 ** 30}|{NOW}|5"),
+    ],
+)
+def test_bad_cursor_falls_back_to_page_number(
+        unlogged_client, many_posts_with_published_locations, cursor
+):
+    for url in get_list_urls(many_posts_with_published_locations):
+        response = unlogged_client.get(url, {"page": 1, "after": cursor})
+        assert response.status_code == HTTPStatus.OK, (
+            "Убедитесь, что некорректный курсор `after` не приводит"
+            f" к ошибке на странице `{url}`."
+        )
+        assert len(response.context["page_obj"]) == N_PER_PAGE
+
+
+def test_cursor_page_matches_page_number(
+        unlogged_client, many_posts_with_published_locations
+):
+    for url in get_list_urls(many_posts_with_published_locations):
+        first_page = unlogged_client.get(url).context["page_obj"]
+        by_number = unlogged_client.get(url, {"page": 2}).context["page_obj"]
+        by_cursor = unlogged_client.get(
+            url, {"after": first_page.next_cursor}
+        ).context["page_obj"]
+        assert by_cursor.number == 2
+        assert list(by_cursor) == list(by_number)
+
+
+def test_cursor_defines_page_number(
+        unlogged_client, many_posts_with_published_locations
+):
+    for url in get_list_urls(many_posts_with_published_locations):
+        first_page = unlogged_client.get(url).context["page_obj"]
+        for page in (1, 2, 5, "junk"):
+            page_obj = unlogged_client.get(
+                url, {"page": page, "after": first_page.next_cursor}
+            ).context["page_obj"]
+            assert page_obj.number == 2, (
+                "Убедитесь, что номер страницы, выбранной по курсору"
+                " `after`, берётся из курсора, а не из параметра `page`."
+            )